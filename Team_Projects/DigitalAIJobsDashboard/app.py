@@ -15,8 +15,9 @@ Prerequisites:
 import streamlit as st
 import duckdb
 import altair as alt
-import pandas as pd
 from pathlib import Path
+import functools
+import threading
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
@@ -34,67 +35,106 @@ st.set_page_config(
 )
 
 
+def get_db_version():
+    """Identify the current database build by the file's modification time."""
+    return DB_PATH.stat().st_mtime_ns
+
+
+@st.cache_resource
+def get_connection_state():
+    """Hold the shared connection and the database version it was opened on."""
+    return {"version": None, "conn": None, "lock": threading.Lock()}
+
+
+def get_cursor(db_version):
+    """
+    Get a cursor on the read-only database connection shared across reruns
+    and sessions. When load_data.py rebuilds the database, db_version changes
+    and the old connection is closed first; DuckDB would otherwise hand back
+    the instance still attached to the deleted file. Each query gets its own
+    cursor, created under the lock so the connection can't be swapped out
+    between picking it up and opening the cursor, since a single DuckDB
+    connection must not be used from several Streamlit session threads at once.
+    """
+    state = get_connection_state()
+    with state["lock"]:
+        if state["version"] != db_version:
+            if state["conn"] is not None:
+                state["conn"].close()
+                state["conn"] = None
+            state["conn"] = duckdb.connect(str(DB_PATH), read_only=True)
+            state["version"] = db_version
+        return state["conn"].cursor()
+
+
+def rerun_on_closed_connection(render):
+    """
+    Rerun the app if a query was cut off by another session reopening the
+    connection after a rebuild; the rerun queries the new database.
+    """
+    @functools.wraps(render)
+    def wrapper(*args, **kwargs):
+        try:
+            return render(*args, **kwargs)
+        except duckdb.ConnectionException:
+            st.rerun()
+    return wrapper
+
+
 def check_database_exists():
-    """Check if the database exists and has data."""
-    if not DB_PATH.exists():
-        return False
-    try:
-        conn = duckdb.connect(str(DB_PATH), read_only=True)
-        count = conn.execute("SELECT COUNT(*) FROM digital_jobs").fetchone()[0]
-        conn.close()
-        return count > 0
-    except Exception:
-        return False
+    """Check if the database file exists."""
+    return DB_PATH.exists()
 
 
-def get_country_trends(selected_countries=None, year_range=None):
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_country_trends(db_version, selected_countries=None, year_range=None):
     """Get country-level demand and supply trends."""
-    conn = duckdb.connect(str(DB_PATH), read_only=True)
+    params = []
     
     query = "SELECT * FROM country_trends WHERE 1=1"
     
     if selected_countries:
-        countries_str = ", ".join([f"'{c}'" for c in selected_countries])
-        query += f" AND country_code IN ({countries_str})"
+        query += " AND list_contains(?, country_code)"
+        params.append(list(selected_countries))
     
     if year_range:
-        query += f" AND year >= {year_range[0]} AND year <= {year_range[1]}"
+        query += " AND year BETWEEN ? AND ?"
+        params.extend(year_range)
     
     query += " ORDER BY country_code, year"
     
-    df = conn.execute(query).df()
-    conn.close()
+    with get_cursor(db_version) as conn:
+        df = conn.execute(query, params).df()
     return df
 
 
-def get_industry_trends(selected_industries=None, year_range=None, selected_countries=None):
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_industry_trends(db_version, selected_industries=None, year_range=None, selected_countries=None):
     """Get industry-level demand and supply trends."""
-    conn = duckdb.connect(str(DB_PATH), read_only=True)
+    params = []
     
-    # If countries are filtered, query from base table; otherwise use aggregated view
+    # If countries are filtered, re-aggregate the per-country table; otherwise use the overall table
     if selected_countries:
         query = """
             SELECT 
                 industry,
                 year,
-                AVG(demand_index) AS avg_demand,
-                AVG(supply_index) AS avg_supply,
-                AVG(gap) AS avg_gap,
+                SUM(sum_demand) / SUM(num_records) AS avg_demand,
+                SUM(sum_supply) / SUM(num_records) AS avg_supply,
+                SUM(sum_gap) / SUM(num_records) AS avg_gap,
                 COUNT(DISTINCT country_code) AS num_countries
-            FROM digital_jobs
-            WHERE 1=1
+            FROM industry_country_trends
+            WHERE list_contains(?, country_code)
         """
-        
-        if selected_countries:
-            countries_str = ", ".join([f"'{c}'" for c in selected_countries])
-            query += f" AND country_code IN ({countries_str})"
+        params.append(list(selected_countries))
         
         if selected_industries:
-            industries_str = ", ".join([f"'{i}'" for i in selected_industries])
-            query += f" AND industry IN ({industries_str})"
+            query += " AND list_contains(?, industry)"
+            params.append(list(selected_industries))
         
         if year_range:
-            query += f" AND year >= {year_range[0]} AND year <= {year_range[1]}"
+            query += " AND year BETWEEN ? AND ?"
+            params.extend(year_range)
         
         query += """
             GROUP BY industry, year
@@ -104,47 +144,47 @@ def get_industry_trends(selected_industries=None, year_range=None, selected_coun
         query = "SELECT * FROM industry_trends WHERE 1=1"
         
         if selected_industries:
-            industries_str = ", ".join([f"'{i}'" for i in selected_industries])
-            query += f" AND industry IN ({industries_str})"
+            query += " AND list_contains(?, industry)"
+            params.append(list(selected_industries))
         
         if year_range:
-            query += f" AND year >= {year_range[0]} AND year <= {year_range[1]}"
+            query += " AND year BETWEEN ? AND ?"
+            params.extend(year_range)
         
         query += " ORDER BY industry, year"
     
-    df = conn.execute(query).df()
-    conn.close()
+    with get_cursor(db_version) as conn:
+        df = conn.execute(query, params).df()
     return df
 
 
-def get_skill_trends(selected_skills=None, year_range=None, selected_countries=None):
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_skill_trends(db_version, selected_skills=None, year_range=None, selected_countries=None):
     """Get skill-level demand and supply trends."""
-    conn = duckdb.connect(str(DB_PATH), read_only=True)
+    params = []
     
-    # If countries are filtered, query from base table; otherwise use aggregated view
+    # If countries are filtered, re-aggregate the per-country table; otherwise use the overall table
     if selected_countries:
         query = """
             SELECT 
                 skill_type,
                 year,
-                AVG(demand_index) AS avg_demand,
-                AVG(supply_index) AS avg_supply,
-                AVG(gap) AS avg_gap,
+                SUM(sum_demand) / SUM(num_records) AS avg_demand,
+                SUM(sum_supply) / SUM(num_records) AS avg_supply,
+                SUM(sum_gap) / SUM(num_records) AS avg_gap,
                 COUNT(DISTINCT country_code) AS num_countries
-            FROM digital_jobs
-            WHERE 1=1
+            FROM skill_country_trends
+            WHERE list_contains(?, country_code)
         """
-        
-        if selected_countries:
-            countries_str = ", ".join([f"'{c}'" for c in selected_countries])
-            query += f" AND country_code IN ({countries_str})"
+        params.append(list(selected_countries))
         
         if selected_skills:
-            skills_str = ", ".join([f"'{s}'" for s in selected_skills])
-            query += f" AND skill_type IN ({skills_str})"
+            query += " AND list_contains(?, skill_type)"
+            params.append(list(selected_skills))
         
         if year_range:
-            query += f" AND year >= {year_range[0]} AND year <= {year_range[1]}"
+            query += " AND year BETWEEN ? AND ?"
+            params.extend(year_range)
         
         query += """
             GROUP BY skill_type, year
@@ -154,173 +194,118 @@ def get_skill_trends(selected_skills=None, year_range=None, selected_countries=N
         query = "SELECT * FROM skill_trends WHERE 1=1"
         
         if selected_skills:
-            skills_str = ", ".join([f"'{s}'" for s in selected_skills])
-            query += f" AND skill_type IN ({skills_str})"
+            query += " AND list_contains(?, skill_type)"
+            params.append(list(selected_skills))
         
         if year_range:
-            query += f" AND year >= {year_range[0]} AND year <= {year_range[1]}"
+            query += " AND year BETWEEN ? AND ?"
+            params.extend(year_range)
         
         query += " ORDER BY skill_type, year"
     
-    df = conn.execute(query).df()
-    conn.close()
+    with get_cursor(db_version) as conn:
+        df = conn.execute(query, params).df()
     return df
 
 
-def get_rising_lagging_analysis(selected_countries=None):
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_rising_lagging_analysis(db_version, selected_countries=None):
     """Get rising/lagging country analysis."""
-    conn = duckdb.connect(str(DB_PATH), read_only=True)
+    params = []
     
     query = "SELECT * FROM rising_lagging_countries WHERE 1=1"
     
     if selected_countries:
-        countries_str = ", ".join([f"'{c}'" for c in selected_countries])
-        query += f" AND country_code IN ({countries_str})"
+        query += " AND list_contains(?, country_code)"
+        params.append(list(selected_countries))
     
     query += " ORDER BY demand_growth_pct DESC"
     
-    df = conn.execute(query).df()
-    conn.close()
+    with get_cursor(db_version) as conn:
+        df = conn.execute(query, params).df()
     return df
 
 
-def get_industry_trends_by_country(selected_industries=None, year_range=None, selected_countries=None):
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_industry_trends_by_country(db_version, selected_industries=None, year_range=None, selected_countries=None):
     """Get industry-level trends broken down by country."""
-    conn = duckdb.connect(str(DB_PATH), read_only=True)
+    params = []
     
-    query = """
-        SELECT 
-            country_code,
-            country_name,
-            industry,
-            year,
-            AVG(demand_index) AS avg_demand,
-            AVG(supply_index) AS avg_supply,
-            AVG(gap) AS avg_gap
-        FROM digital_jobs
-        WHERE 1=1
-    """
+    query = "SELECT * FROM industry_country_trends WHERE 1=1"
     
     if selected_countries:
-        countries_str = ", ".join([f"'{c}'" for c in selected_countries])
-        query += f" AND country_code IN ({countries_str})"
+        query += " AND list_contains(?, country_code)"
+        params.append(list(selected_countries))
     
     if selected_industries:
-        industries_str = ", ".join([f"'{i}'" for i in selected_industries])
-        query += f" AND industry IN ({industries_str})"
+        query += " AND list_contains(?, industry)"
+        params.append(list(selected_industries))
     
     if year_range:
-        query += f" AND year >= {year_range[0]} AND year <= {year_range[1]}"
+        query += " AND year BETWEEN ? AND ?"
+        params.extend(year_range)
     
-    query += """
-        GROUP BY country_code, country_name, industry, year
-        ORDER BY country_code, industry, year
-    """
+    query += " ORDER BY country_code, industry, year"
     
-    df = conn.execute(query).df()
-    conn.close()
+    with get_cursor(db_version) as conn:
+        df = conn.execute(query, params).df()
     return df
 
 
-def get_skill_trends_by_country(selected_skills=None, year_range=None, selected_countries=None):
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_skill_trends_by_country(db_version, selected_skills=None, year_range=None, selected_countries=None):
     """Get skill-level trends broken down by country."""
-    conn = duckdb.connect(str(DB_PATH), read_only=True)
+    params = []
     
-    query = """
-        SELECT 
-            country_code,
-            country_name,
-            skill_type,
-            year,
-            AVG(demand_index) AS avg_demand,
-            AVG(supply_index) AS avg_supply,
-            AVG(gap) AS avg_gap
-        FROM digital_jobs
-        WHERE 1=1
-    """
+    query = "SELECT * FROM skill_country_trends WHERE 1=1"
     
     if selected_countries:
-        countries_str = ", ".join([f"'{c}'" for c in selected_countries])
-        query += f" AND country_code IN ({countries_str})"
+        query += " AND list_contains(?, country_code)"
+        params.append(list(selected_countries))
     
     if selected_skills:
-        skills_str = ", ".join([f"'{s}'" for s in selected_skills])
-        query += f" AND skill_type IN ({skills_str})"
+        query += " AND list_contains(?, skill_type)"
+        params.append(list(selected_skills))
     
     if year_range:
-        query += f" AND year >= {year_range[0]} AND year <= {year_range[1]}"
+        query += " AND year BETWEEN ? AND ?"
+        params.extend(year_range)
     
-    query += """
-        GROUP BY country_code, country_name, skill_type, year
-        ORDER BY country_code, skill_type, year
-    """
+    query += " ORDER BY country_code, skill_type, year"
     
-    df = conn.execute(query).df()
-    conn.close()
+    with get_cursor(db_version) as conn:
+        df = conn.execute(query, params).df()
     return df
 
 
-def get_available_countries():
-    """Get list of available countries."""
-    conn = duckdb.connect(str(DB_PATH), read_only=True)
-    countries = conn.execute("""
-        SELECT DISTINCT country_code, country_name 
-        FROM digital_jobs 
-        ORDER BY country_name
-    """).fetchall()
-    conn.close()
-    return [(c[0], c[1]) for c in countries]
-
-
-def get_available_industries():
-    """Get list of available industries."""
-    conn = duckdb.connect(str(DB_PATH), read_only=True)
-    industries = conn.execute("""
-        SELECT DISTINCT industry 
-        FROM digital_jobs 
-        ORDER BY industry
-    """).fetchall()
-    conn.close()
-    return [i[0] for i in industries]
-
-
-def get_available_skills():
-    """Get list of available skill types."""
-    conn = duckdb.connect(str(DB_PATH), read_only=True)
-    skills = conn.execute("""
-        SELECT DISTINCT skill_type 
-        FROM digital_jobs 
-        ORDER BY skill_type
-    """).fetchall()
-    conn.close()
-    return [s[0] for s in skills]
-
-
-def get_year_range():
-    """Get the min and max years from the database."""
-    conn = duckdb.connect(str(DB_PATH), read_only=True)
-    result = conn.execute("SELECT MIN(year), MAX(year) FROM digital_jobs").fetchone()
-    conn.close()
-    return int(result[0]), int(result[1])
+@st.cache_data(ttl=3600, show_spinner=False)
+def get_bootstrap_metadata(db_version):
+    """Get the sidebar filter options and year range in a single query."""
+    # Read the options from the small pre-aggregated tables, with countries
+    # already shaped as [code, name] pairs so no Python post-processing is needed
+    with get_cursor(db_version) as conn:
+        countries, industries, skills, min_year, max_year = conn.execute("""
+            SELECT 
+                (SELECT list([country_code, country_name] ORDER BY country_name, country_code)
+                 FROM (SELECT DISTINCT country_code, country_name FROM country_trends)),
+                (SELECT list(DISTINCT industry ORDER BY industry) FROM industry_trends),
+                (SELECT list(DISTINCT skill_type ORDER BY skill_type) FROM skill_trends),
+                min_year,
+                max_year
+            FROM meta
+        """).fetchone()
+    return countries, industries, skills, int(min_year), int(max_year)
 
 
 def create_demand_supply_chart(df, x_col, color_col, title):
     """Create a dual-axis chart showing demand and supply trends."""
-    # Prepare data for Altair
-    df_melted = df.melt(
-        id_vars=[x_col, color_col],
-        value_vars=['avg_demand', 'avg_supply'],
-        var_name='metric',
-        value_name='value'
-    )
-    
-    # Map metric names
-    df_melted['metric'] = df_melted['metric'].map({
-        'avg_demand': 'Demand',
-        'avg_supply': 'Supply'
-    })
-    
-    chart = alt.Chart(df_melted).mark_line(point=True, strokeWidth=2).encode(
+    # Reshape to long form in Vega-Lite rather than melting a pandas copy
+    chart = alt.Chart(df[[x_col, color_col, 'avg_demand', 'avg_supply']]).transform_fold(
+        ['avg_demand', 'avg_supply'],
+        as_=['metric', 'value']
+    ).transform_calculate(
+        metric="datum.metric === 'avg_demand' ? 'Demand' : 'Supply'"
+    ).mark_line(point=True, strokeWidth=2).encode(
         x=alt.X(f'{x_col}:O', title=x_col.replace('_', ' ').title()),
         y=alt.Y('value:Q', title='Index Value', scale=alt.Scale(zero=False)),
         color=alt.Color('metric:N', 
@@ -364,36 +349,59 @@ def create_gap_chart(df, x_col, color_col, title):
     return chart
 
 
-def create_rising_lagging_map(df):
-    """Create visualization of rising vs lagging countries."""
-    chart = alt.Chart(df).mark_circle(size=200).encode(
-        x=alt.X('demand_growth_pct:Q', 
-               title='Demand Growth (%)',
-               scale=alt.Scale(domain=[-50, 150])),
-        y=alt.Y('supply_growth_pct:Q', 
-               title='Supply Growth (%)',
-               scale=alt.Scale(domain=[-50, 150])),
-        color=alt.Color('trend_status:N',
-                       scale=alt.Scale(domain=['Rising', 'Moderate', 'Lagging'],
-                                      range=['#2ecc71', '#f39c12', '#e74c3c']),
-                       title='Status'),
-        size=alt.Size('recent_demand:Q', title='Recent Demand'),
-        tooltip=[
-            alt.Tooltip('country_name:N', title='Country'),
-            alt.Tooltip('demand_growth_pct:Q', title='Demand Growth %', format='.1f'),
-            alt.Tooltip('supply_growth_pct:Q', title='Supply Growth %', format='.1f'),
-            alt.Tooltip('trend_status:N', title='Status')
-        ]
-    ).properties(
-        height=500,
-        title='Rising vs Lagging Countries: Demand & Supply Growth'
-    ).interactive()
-    
-    # Add quadrant lines
-    hline = alt.Chart(pd.DataFrame({'y': [0]})).mark_rule(strokeDash=[5, 5]).encode(y='y:Q')
-    vline = alt.Chart(pd.DataFrame({'x': [0]})).mark_rule(strokeDash=[5, 5]).encode(x='x:Q')
-    
-    return hline + vline + chart
+# Vega-Lite spec for the rising vs lagging scatter, built once at import rather
+# than through Altair's object graph on every rerun
+RISING_LAGGING_SPEC = {
+    "title": "Rising vs Lagging Countries: Demand & Supply Growth",
+    "height": 500,
+    "layer": [
+        # Quadrant lines
+        {
+            "data": {"values": [{}]},
+            "mark": {"type": "rule", "strokeDash": [5, 5]},
+            "encoding": {"y": {"datum": 0}}
+        },
+        {
+            "data": {"values": [{}]},
+            "mark": {"type": "rule", "strokeDash": [5, 5]},
+            "encoding": {"x": {"datum": 0}}
+        },
+        {
+            "mark": {"type": "circle", "size": 200},
+            "params": [{"name": "grid", "select": "interval", "bind": "scales"}],
+            "encoding": {
+                "x": {
+                    "field": "demand_growth_pct",
+                    "type": "quantitative",
+                    "title": "Demand Growth (%)",
+                    "scale": {"domain": [-50, 150]}
+                },
+                "y": {
+                    "field": "supply_growth_pct",
+                    "type": "quantitative",
+                    "title": "Supply Growth (%)",
+                    "scale": {"domain": [-50, 150]}
+                },
+                "color": {
+                    "field": "trend_status",
+                    "type": "nominal",
+                    "title": "Status",
+                    "scale": {
+                        "domain": ["Rising", "Moderate", "Lagging"],
+                        "range": ["#2ecc71", "#f39c12", "#e74c3c"]
+                    }
+                },
+                "size": {"field": "recent_demand", "type": "quantitative", "title": "Recent Demand"},
+                "tooltip": [
+                    {"field": "country_name", "type": "nominal", "title": "Country"},
+                    {"field": "demand_growth_pct", "type": "quantitative", "title": "Demand Growth %", "format": ".1f"},
+                    {"field": "supply_growth_pct", "type": "quantitative", "title": "Supply Growth %", "format": ".1f"},
+                    {"field": "trend_status", "type": "nominal", "title": "Status"}
+                ]
+            }
+        }
+    ]
+}
 
 
 def get_country_iso3_mapping():
@@ -467,9 +475,10 @@ def create_choropleth_map(df, value_col, title, color_scale="Viridis", reverse=F
     return fig
 
 
-def create_country_map_data(selected_countries=None, year_range=None, metric='avg_gap'):
+@st.cache_data(ttl=3600, show_spinner=False)
+def create_country_map_data(db_version, selected_countries=None, year_range=None, metric='avg_gap'):
     """Get country-level data for mapping."""
-    conn = duckdb.connect(str(DB_PATH), read_only=True)
+    params = []
     
     # Get latest year data or average across year range
     query = f"""
@@ -482,19 +491,20 @@ def create_country_map_data(selected_countries=None, year_range=None, metric='av
     """
     
     if selected_countries:
-        countries_str = ", ".join([f"'{c}'" for c in selected_countries])
-        query += f" AND country_code IN ({countries_str})"
+        query += " AND list_contains(?, country_code)"
+        params.append(list(selected_countries))
     
     if year_range:
-        query += f" AND year >= {year_range[0]} AND year <= {year_range[1]}"
+        query += " AND year BETWEEN ? AND ?"
+        params.extend(year_range)
     
     query += """
         GROUP BY country_code, country_name
         ORDER BY value DESC
     """
     
-    df = conn.execute(query).df()
-    conn.close()
+    with get_cursor(db_version) as conn:
+        df = conn.execute(query, params).df()
     
     if metric == 'avg_gap':
         df.rename(columns={'value': 'avg_gap'}, inplace=True)
@@ -506,6 +516,305 @@ def create_country_map_data(selected_countries=None, year_range=None, metric='av
     return df
 
 
+@st.fragment
+@rerun_on_closed_connection
+def render_country_trends(db_version, selected_country_codes, country_key, year_range):
+    """Render the country trends view."""
+    st.header("📊 Country-Level Trends")
+    
+    if selected_country_codes:
+        country_df = get_country_trends(db_version, country_key, year_range)
+        
+        if not country_df.empty:
+            # Demand vs Supply chart
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                chart = create_demand_supply_chart(
+                    country_df, 
+                    'year', 
+                    'country_name',
+                    'Demand vs Supply Trends by Country'
+                )
+                st.altair_chart(chart, use_container_width=True)
+            
+            with col2:
+                gap_chart = create_gap_chart(
+                    country_df.groupby(['country_name', 'year'])['avg_gap'].mean().reset_index(),
+                    'year',
+                    'country_name',
+                    'Demand-Supply Gap Over Time'
+                )
+                st.altair_chart(gap_chart, use_container_width=True)
+            
+            # Summary metrics
+            st.subheader("📈 Summary Metrics")
+            recent_data = country_df[country_df['year'] >= year_range[1] - 2]
+            if not recent_data.empty:
+                cols = st.columns(min(len(selected_country_codes), 5))
+                for i, country_code in enumerate(selected_country_codes[:5]):
+                    country_data = recent_data[recent_data['country_code'] == country_code]
+                    if not country_data.empty:
+                        with cols[i % len(cols)]:
+                            country_name = country_data.iloc[0]['country_name']
+                            avg_demand = country_data['avg_demand'].mean()
+                            avg_supply = country_data['avg_supply'].mean()
+                            gap = avg_demand - avg_supply
+                            
+                            st.metric(
+                                label=country_name,
+                                value=f"{gap:.1f}",
+                                delta=f"D: {avg_demand:.1f}, S: {avg_supply:.1f}",
+                                help=f"Gap = Demand - Supply"
+                            )
+            
+            # Map visualizations
+            st.subheader("🗺️ Geographic Distribution")
+            st.caption(f"Showing data for {len(selected_country_codes)} selected countries ({year_range[0]}-{year_range[1]})")
+            
+            map_data = create_country_map_data(db_version, country_key, year_range, 'avg_gap')
+            
+            if not map_data.empty:
+                # Map metric selector
+                map_metric = st.radio(
+                    "Map Metric",
+                    ["Demand-Supply Gap", "Demand", "Supply"],
+                    horizontal=True,
+                    key="map_metric"
+                )
+                
+                if map_metric == "Demand-Supply Gap":
+                    map_df = create_country_map_data(db_version, country_key, year_range, 'avg_gap')
+                    value_col = 'avg_gap'
+                    title = f'Digital/AI Jobs: Demand-Supply Gap by Country ({year_range[0]}-{year_range[1]})'
+                    color_scale = "Gap"
+                elif map_metric == "Demand":
+                    map_df = create_country_map_data(db_version, country_key, year_range, 'avg_demand')
+                    value_col = 'avg_demand'
+                    title = f'Digital/AI Jobs: Demand Index by Country ({year_range[0]}-{year_range[1]})'
+                    color_scale = "Viridis"
+                else:  # Supply
+                    map_df = create_country_map_data(db_version, country_key, year_range, 'avg_supply')
+                    value_col = 'avg_supply'
+                    title = f'Digital/AI Jobs: Supply Index by Country ({year_range[0]}-{year_range[1]})'
+                    color_scale = "Viridis"
+                
+                if not map_df.empty:
+                    fig = create_choropleth_map(map_df, value_col, title, color_scale, selected_countries=selected_country_codes)
+                    if fig:
+                        st.plotly_chart(fig, use_container_width=True)
+            
+            # Data table
+            with st.expander("📋 View Detailed Data"):
+                st.dataframe(
+                    country_df[['country_name', 'year', 'avg_demand', 'avg_supply', 'avg_gap']].rename(columns={
+                        'country_name': 'Country',
+                        'year': 'Year',
+                        'avg_demand': 'Avg Demand',
+                        'avg_supply': 'Avg Supply',
+                        'avg_gap': 'Gap'
+                    }),
+                    use_container_width=True,
+                    hide_index=True
+                )
+        else:
+            st.warning("No data available for selected filters.")
+
+
+@st.fragment
+@rerun_on_closed_connection
+def render_industry_trends(db_version, countries, industries, selected_country_codes, country_key, year_range):
+    """Render the industry trends view."""
+    st.header("🏭 Industry-Level Trends")
+    if selected_country_codes:
+        country_names = [next((c[1] for c in countries if c[0] == code), code) for code in selected_country_codes]
+        st.caption(f"📌 Showing data for {len(selected_country_codes)} selected countries: {', '.join(country_names[:5])}{'...' if len(country_names) > 5 else ''} ({year_range[0]}-{year_range[1]})")
+    
+    # Industry filter
+    selected_industries = st.multiselect(
+        "Select Industries",
+        options=industries,
+        default=industries[:4]
+    )
+    
+    if selected_industries:
+        industry_key = tuple(sorted(selected_industries))
+        industry_df = get_industry_trends(db_version, industry_key, year_range, country_key)
+        industry_by_country_df = get_industry_trends_by_country(db_version, industry_key, year_range, country_key)
+        
+        if not industry_df.empty:
+            # Charts
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                chart = create_demand_supply_chart(
+                    industry_df,
+                    'year',
+                    'industry',
+                    'Demand vs Supply by Industry (Aggregated)'
+                )
+                st.altair_chart(chart, use_container_width=True)
+            
+            with col2:
+                # Latest year comparison
+                latest_year = industry_df['year'].max()
+                latest_data = industry_df[industry_df['year'] == latest_year]
+                
+                bar_chart = alt.Chart(latest_data).mark_bar().encode(
+                    x=alt.X('industry:N', title='Industry'),
+                    y=alt.Y('avg_gap:Q', title='Gap'),
+                    color=alt.Color('avg_gap:Q', 
+                                   scale=alt.Scale(scheme='redyellowgreen', domainMid=0)),
+                    tooltip=['industry:N', 'avg_gap:Q']
+                ).properties(
+                    height=400,
+                    title=f'Demand-Supply Gap by Industry ({int(latest_year)})'
+                )
+                st.altair_chart(bar_chart, use_container_width=True)
+            
+            # Country breakdown by industry
+            if not industry_by_country_df.empty:
+                st.subheader("📊 Industry Trends by Selected Countries")
+                
+                # Latest year data by country and industry
+                latest_year = industry_by_country_df['year'].max()
+                latest_by_country = industry_by_country_df[industry_by_country_df['year'] == latest_year]
+                
+                # Create a heatmap or grouped bar chart showing countries vs industries
+                heatmap_data = latest_by_country.pivot_table(
+                    index='country_name',
+                    columns='industry',
+                    values='avg_gap',
+                    aggfunc='mean'
+                )
+                
+                # Create grouped bar chart
+                grouped_chart = alt.Chart(latest_by_country).mark_bar().encode(
+                    x=alt.X('country_name:N', title='Country', sort='-y'),
+                    y=alt.Y('avg_gap:Q', title='Demand-Supply Gap'),
+                    color=alt.Color('industry:N', title='Industry'),
+                    tooltip=['country_name:N', 'industry:N', 'avg_gap:Q']
+                ).properties(
+                    height=400,
+                    title=f'Gap by Country and Industry ({int(latest_year)})'
+                )
+                st.altair_chart(grouped_chart, use_container_width=True)
+                
+                # Show country breakdown table
+                with st.expander("📋 View Country-Industry Breakdown"):
+                    display_df = latest_by_country[['country_name', 'industry', 'avg_demand', 'avg_supply', 'avg_gap']].rename(columns={
+                        'country_name': 'Country',
+                        'industry': 'Industry',
+                        'avg_demand': 'Avg Demand',
+                        'avg_supply': 'Avg Supply',
+                        'avg_gap': 'Gap'
+                    })
+                    st.dataframe(display_df, use_container_width=True, hide_index=True)
+            
+            # Summary table
+            with st.expander("📋 View Industry Summary (Aggregated)"):
+                summary = industry_df.groupby('industry').agg({
+                    'avg_demand': 'mean',
+                    'avg_supply': 'mean',
+                    'avg_gap': 'mean'
+                }).reset_index()
+                summary.columns = ['Industry', 'Avg Demand', 'Avg Supply', 'Avg Gap']
+                st.dataframe(summary, use_container_width=True, hide_index=True)
+
+
+@st.fragment
+@rerun_on_closed_connection
+def render_skill_trends(db_version, countries, skills, selected_country_codes, country_key, year_range):
+    """Render the skill trends view."""
+    st.header("🎯 Skill Type Trends")
+    if selected_country_codes:
+        country_names = [next((c[1] for c in countries if c[0] == code), code) for code in selected_country_codes]
+        st.caption(f"📌 Showing data for {len(selected_country_codes)} selected countries: {', '.join(country_names[:5])}{'...' if len(country_names) > 5 else ''} ({year_range[0]}-{year_range[1]})")
+    
+    # Skill filter
+    selected_skills = st.multiselect(
+        "Select Skill Types",
+        options=skills,
+        default=skills[:4]
+    )
+    
+    if selected_skills:
+        skill_key = tuple(sorted(selected_skills))
+        skill_df = get_skill_trends(db_version, skill_key, year_range, country_key)
+        skill_by_country_df = get_skill_trends_by_country(db_version, skill_key, year_range, country_key)
+        
+        if not skill_df.empty:
+            # Charts
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                chart = create_demand_supply_chart(
+                    skill_df,
+                    'year',
+                    'skill_type',
+                    'Demand vs Supply by Skill Type (Aggregated)'
+                )
+                st.altair_chart(chart, use_container_width=True)
+            
+            with col2:
+                # Latest year comparison
+                latest_year = skill_df['year'].max()
+                latest_data = skill_df[skill_df['year'] == latest_year]
+                
+                bar_chart = alt.Chart(latest_data).mark_bar().encode(
+                    x=alt.X('skill_type:N', title='Skill Type'),
+                    y=alt.Y('avg_gap:Q', title='Gap'),
+                    color=alt.Color('avg_gap:Q',
+                                   scale=alt.Scale(scheme='redyellowgreen', domainMid=0)),
+                    tooltip=['skill_type:N', 'avg_gap:Q']
+                ).properties(
+                    height=400,
+                    title=f'Demand-Supply Gap by Skill ({int(latest_year)})'
+                )
+                st.altair_chart(bar_chart, use_container_width=True)
+            
+            # Country breakdown by skill
+            if not skill_by_country_df.empty:
+                st.subheader("📊 Skill Trends by Selected Countries")
+                
+                # Latest year data by country and skill
+                latest_year = skill_by_country_df['year'].max()
+                latest_by_country = skill_by_country_df[skill_by_country_df['year'] == latest_year]
+                
+                # Create grouped bar chart showing countries vs skills
+                grouped_chart = alt.Chart(latest_by_country).mark_bar().encode(
+                    x=alt.X('country_name:N', title='Country', sort='-y'),
+                    y=alt.Y('avg_gap:Q', title='Demand-Supply Gap'),
+                    color=alt.Color('skill_type:N', title='Skill Type'),
+                    tooltip=['country_name:N', 'skill_type:N', 'avg_gap:Q']
+                ).properties(
+                    height=400,
+                    title=f'Gap by Country and Skill Type ({int(latest_year)})'
+                )
+                st.altair_chart(grouped_chart, use_container_width=True)
+                
+                # Show country breakdown table
+                with st.expander("📋 View Country-Skill Breakdown"):
+                    display_df = latest_by_country[['country_name', 'skill_type', 'avg_demand', 'avg_supply', 'avg_gap']].rename(columns={
+                        'country_name': 'Country',
+                        'skill_type': 'Skill Type',
+                        'avg_demand': 'Avg Demand',
+                        'avg_supply': 'Avg Supply',
+                        'avg_gap': 'Gap'
+                    })
+                    st.dataframe(display_df, use_container_width=True, hide_index=True)
+            
+            # Summary table
+            with st.expander("📋 View Skill Summary (Aggregated)"):
+                summary = skill_df.groupby('skill_type').agg({
+                    'avg_demand': 'mean',
+                    'avg_supply': 'mean',
+                    'avg_gap': 'mean'
+                }).reset_index()
+                summary.columns = ['Skill Type', 'Avg Demand', 'Avg Supply', 'Avg Gap']
+                st.dataframe(summary, use_container_width=True, hide_index=True)
+
+
 def main():
     """Main Streamlit app."""
     # Header
@@ -521,15 +830,22 @@ def main():
         st.code("python load_data.py", language="bash")
         return
     
+    try:
+        # Cached queries and the connection are keyed on this, so rebuilding
+        # the database with load_data.py is picked up without a restart
+        db_version = get_db_version()
+        
+        # Get available options
+        countries, industries, skills, min_year, max_year = get_bootstrap_metadata(db_version)
+    except (duckdb.Error, OSError):
+        # Tables from an older load_data.py, or a rebuild still holding the write lock
+        st.error("⚠️ Database is out of date or being rebuilt. Please re-run `python load_data.py` and refresh once it finishes.")
+        st.code("python load_data.py", language="bash")
+        return
+    
     # Sidebar filters
     st.sidebar.header("🔧 Filters")
     
-    # Get available options
-    countries = get_available_countries()
-    industries = get_available_industries()
-    skills = get_available_skills()
-    min_year, max_year = get_year_range()
-    
     # Country filter (global - applies to all views)
     selected_country_codes = st.sidebar.multiselect(
         "Select Countries",
@@ -548,6 +864,13 @@ def main():
         help="Filter data by year range"
     )
     
+    # Cached query helpers key on their arguments; sort so selection order doesn't matter.
+    # Selecting every country is the same as no filter, which reads the overall tables.
+    if len(selected_country_codes) < len(countries):
+        country_key = tuple(sorted(selected_country_codes))
+    else:
+        country_key = ()
+    
     # Analysis view selector
     view = st.sidebar.radio(
         "Analysis View",
@@ -560,292 +883,16 @@ def main():
     if not selected_country_codes:
         st.warning("⚠️ Please select at least one country from the sidebar filters to view data.")
     
+    # Views with their own widgets are fragments, so changing those widgets
+    # reruns only the view instead of the whole app
     if view == "Country Trends":
-        st.header("📊 Country-Level Trends")
-        
-        if selected_country_codes:
-            country_df = get_country_trends(selected_country_codes, year_range)
-            
-            if not country_df.empty:
-                # Demand vs Supply chart
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    chart = create_demand_supply_chart(
-                        country_df, 
-                        'year', 
-                        'country_name',
-                        'Demand vs Supply Trends by Country'
-                    )
-                    st.altair_chart(chart, use_container_width=True)
-                
-                with col2:
-                    gap_chart = create_gap_chart(
-                        country_df.groupby(['country_name', 'year'])['avg_gap'].mean().reset_index(),
-                        'year',
-                        'country_name',
-                        'Demand-Supply Gap Over Time'
-                    )
-                    st.altair_chart(gap_chart, use_container_width=True)
-                
-                # Summary metrics
-                st.subheader("📈 Summary Metrics")
-                recent_data = country_df[country_df['year'] >= year_range[1] - 2]
-                if not recent_data.empty:
-                    cols = st.columns(min(len(selected_country_codes), 5))
-                    for i, country_code in enumerate(selected_country_codes[:5]):
-                        country_data = recent_data[recent_data['country_code'] == country_code]
-                        if not country_data.empty:
-                            with cols[i % len(cols)]:
-                                country_name = country_data.iloc[0]['country_name']
-                                avg_demand = country_data['avg_demand'].mean()
-                                avg_supply = country_data['avg_supply'].mean()
-                                gap = avg_demand - avg_supply
-                                
-                                st.metric(
-                                    label=country_name,
-                                    value=f"{gap:.1f}",
-                                    delta=f"D: {avg_demand:.1f}, S: {avg_supply:.1f}",
-                                    help=f"Gap = Demand - Supply"
-                                )
-                
-                # Map visualizations
-                st.subheader("🗺️ Geographic Distribution")
-                st.caption(f"Showing data for {len(selected_country_codes)} selected countries ({year_range[0]}-{year_range[1]})")
-                
-                # Get latest year data for mapping
-                latest_year = country_df['year'].max()
-                map_data = create_country_map_data(selected_country_codes, year_range, 'avg_gap')
-                
-                if not map_data.empty:
-                    # Map metric selector
-                    map_metric = st.radio(
-                        "Map Metric",
-                        ["Demand-Supply Gap", "Demand", "Supply"],
-                        horizontal=True,
-                        key="map_metric"
-                    )
-                    
-                    if map_metric == "Demand-Supply Gap":
-                        map_df = create_country_map_data(selected_country_codes, year_range, 'avg_gap')
-                        value_col = 'avg_gap'
-                        title = f'Digital/AI Jobs: Demand-Supply Gap by Country ({year_range[0]}-{year_range[1]})'
-                        color_scale = "Gap"
-                    elif map_metric == "Demand":
-                        map_df = create_country_map_data(selected_country_codes, year_range, 'avg_demand')
-                        value_col = 'avg_demand'
-                        title = f'Digital/AI Jobs: Demand Index by Country ({year_range[0]}-{year_range[1]})'
-                        color_scale = "Viridis"
-                    else:  # Supply
-                        map_df = create_country_map_data(selected_country_codes, year_range, 'avg_supply')
-                        value_col = 'avg_supply'
-                        title = f'Digital/AI Jobs: Supply Index by Country ({year_range[0]}-{year_range[1]})'
-                        color_scale = "Viridis"
-                    
-                    if not map_df.empty:
-                        fig = create_choropleth_map(map_df, value_col, title, color_scale, selected_countries=selected_country_codes)
-                        if fig:
-                            st.plotly_chart(fig, use_container_width=True)
-                
-                # Data table
-                with st.expander("📋 View Detailed Data"):
-                    st.dataframe(
-                        country_df[['country_name', 'year', 'avg_demand', 'avg_supply', 'avg_gap']].rename(columns={
-                            'country_name': 'Country',
-                            'year': 'Year',
-                            'avg_demand': 'Avg Demand',
-                            'avg_supply': 'Avg Supply',
-                            'avg_gap': 'Gap'
-                        }),
-                        use_container_width=True,
-                        hide_index=True
-                    )
-            else:
-                st.warning("No data available for selected filters.")
+        render_country_trends(db_version, selected_country_codes, country_key, year_range)
     
     elif view == "Industry Trends":
-        st.header("🏭 Industry-Level Trends")
-        if selected_country_codes:
-            country_names = [next((c[1] for c in countries if c[0] == code), code) for code in selected_country_codes]
-            st.caption(f"📌 Showing data for {len(selected_country_codes)} selected countries: {', '.join(country_names[:5])}{'...' if len(country_names) > 5 else ''} ({year_range[0]}-{year_range[1]})")
-        
-        # Industry filter
-        selected_industries = st.multiselect(
-            "Select Industries",
-            options=industries,
-            default=industries[:4]
-        )
-        
-        if selected_industries:
-            industry_df = get_industry_trends(selected_industries, year_range, selected_country_codes)
-            industry_by_country_df = get_industry_trends_by_country(selected_industries, year_range, selected_country_codes)
-            
-            if not industry_df.empty:
-                # Charts
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    chart = create_demand_supply_chart(
-                        industry_df,
-                        'year',
-                        'industry',
-                        'Demand vs Supply by Industry (Aggregated)'
-                    )
-                    st.altair_chart(chart, use_container_width=True)
-                
-                with col2:
-                    # Latest year comparison
-                    latest_year = industry_df['year'].max()
-                    latest_data = industry_df[industry_df['year'] == latest_year]
-                    
-                    bar_chart = alt.Chart(latest_data).mark_bar().encode(
-                        x=alt.X('industry:N', title='Industry'),
-                        y=alt.Y('avg_gap:Q', title='Gap'),
-                        color=alt.Color('avg_gap:Q', 
-                                       scale=alt.Scale(scheme='redyellowgreen', domainMid=0)),
-                        tooltip=['industry:N', 'avg_gap:Q']
-                    ).properties(
-                        height=400,
-                        title=f'Demand-Supply Gap by Industry ({int(latest_year)})'
-                    )
-                    st.altair_chart(bar_chart, use_container_width=True)
-                
-                # Country breakdown by industry
-                if not industry_by_country_df.empty:
-                    st.subheader("📊 Industry Trends by Selected Countries")
-                    
-                    # Latest year data by country and industry
-                    latest_year = industry_by_country_df['year'].max()
-                    latest_by_country = industry_by_country_df[industry_by_country_df['year'] == latest_year]
-                    
-                    # Create a heatmap or grouped bar chart showing countries vs industries
-                    heatmap_data = latest_by_country.pivot_table(
-                        index='country_name',
-                        columns='industry',
-                        values='avg_gap',
-                        aggfunc='mean'
-                    )
-                    
-                    # Create grouped bar chart
-                    grouped_chart = alt.Chart(latest_by_country).mark_bar().encode(
-                        x=alt.X('country_name:N', title='Country', sort='-y'),
-                        y=alt.Y('avg_gap:Q', title='Demand-Supply Gap'),
-                        color=alt.Color('industry:N', title='Industry'),
-                        tooltip=['country_name:N', 'industry:N', 'avg_gap:Q']
-                    ).properties(
-                        height=400,
-                        title=f'Gap by Country and Industry ({int(latest_year)})'
-                    )
-                    st.altair_chart(grouped_chart, use_container_width=True)
-                    
-                    # Show country breakdown table
-                    with st.expander("📋 View Country-Industry Breakdown"):
-                        display_df = latest_by_country[['country_name', 'industry', 'avg_demand', 'avg_supply', 'avg_gap']].rename(columns={
-                            'country_name': 'Country',
-                            'industry': 'Industry',
-                            'avg_demand': 'Avg Demand',
-                            'avg_supply': 'Avg Supply',
-                            'avg_gap': 'Gap'
-                        })
-                        st.dataframe(display_df, use_container_width=True, hide_index=True)
-                
-                # Summary table
-                with st.expander("📋 View Industry Summary (Aggregated)"):
-                    summary = industry_df.groupby('industry').agg({
-                        'avg_demand': 'mean',
-                        'avg_supply': 'mean',
-                        'avg_gap': 'mean'
-                    }).reset_index()
-                    summary.columns = ['Industry', 'Avg Demand', 'Avg Supply', 'Avg Gap']
-                    st.dataframe(summary, use_container_width=True, hide_index=True)
+        render_industry_trends(db_version, countries, industries, selected_country_codes, country_key, year_range)
     
     elif view == "Skill Trends":
-        st.header("🎯 Skill Type Trends")
-        if selected_country_codes:
-            country_names = [next((c[1] for c in countries if c[0] == code), code) for code in selected_country_codes]
-            st.caption(f"📌 Showing data for {len(selected_country_codes)} selected countries: {', '.join(country_names[:5])}{'...' if len(country_names) > 5 else ''} ({year_range[0]}-{year_range[1]})")
-        
-        # Skill filter
-        selected_skills = st.multiselect(
-            "Select Skill Types",
-            options=skills,
-            default=skills[:4]
-        )
-        
-        if selected_skills:
-            skill_df = get_skill_trends(selected_skills, year_range, selected_country_codes)
-            skill_by_country_df = get_skill_trends_by_country(selected_skills, year_range, selected_country_codes)
-            
-            if not skill_df.empty:
-                # Charts
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    chart = create_demand_supply_chart(
-                        skill_df,
-                        'year',
-                        'skill_type',
-                        'Demand vs Supply by Skill Type (Aggregated)'
-                    )
-                    st.altair_chart(chart, use_container_width=True)
-                
-                with col2:
-                    # Latest year comparison
-                    latest_year = skill_df['year'].max()
-                    latest_data = skill_df[skill_df['year'] == latest_year]
-                    
-                    bar_chart = alt.Chart(latest_data).mark_bar().encode(
-                        x=alt.X('skill_type:N', title='Skill Type'),
-                        y=alt.Y('avg_gap:Q', title='Gap'),
-                        color=alt.Color('avg_gap:Q',
-                                       scale=alt.Scale(scheme='redyellowgreen', domainMid=0)),
-                        tooltip=['skill_type:N', 'avg_gap:Q']
-                    ).properties(
-                        height=400,
-                        title=f'Demand-Supply Gap by Skill ({int(latest_year)})'
-                    )
-                    st.altair_chart(bar_chart, use_container_width=True)
-                
-                # Country breakdown by skill
-                if not skill_by_country_df.empty:
-                    st.subheader("📊 Skill Trends by Selected Countries")
-                    
-                    # Latest year data by country and skill
-                    latest_year = skill_by_country_df['year'].max()
-                    latest_by_country = skill_by_country_df[skill_by_country_df['year'] == latest_year]
-                    
-                    # Create grouped bar chart showing countries vs skills
-                    grouped_chart = alt.Chart(latest_by_country).mark_bar().encode(
-                        x=alt.X('country_name:N', title='Country', sort='-y'),
-                        y=alt.Y('avg_gap:Q', title='Demand-Supply Gap'),
-                        color=alt.Color('skill_type:N', title='Skill Type'),
-                        tooltip=['country_name:N', 'skill_type:N', 'avg_gap:Q']
-                    ).properties(
-                        height=400,
-                        title=f'Gap by Country and Skill Type ({int(latest_year)})'
-                    )
-                    st.altair_chart(grouped_chart, use_container_width=True)
-                    
-                    # Show country breakdown table
-                    with st.expander("📋 View Country-Skill Breakdown"):
-                        display_df = latest_by_country[['country_name', 'skill_type', 'avg_demand', 'avg_supply', 'avg_gap']].rename(columns={
-                            'country_name': 'Country',
-                            'skill_type': 'Skill Type',
-                            'avg_demand': 'Avg Demand',
-                            'avg_supply': 'Avg Supply',
-                            'avg_gap': 'Gap'
-                        })
-                        st.dataframe(display_df, use_container_width=True, hide_index=True)
-                
-                # Summary table
-                with st.expander("📋 View Skill Summary (Aggregated)"):
-                    summary = skill_df.groupby('skill_type').agg({
-                        'avg_demand': 'mean',
-                        'avg_supply': 'mean',
-                        'avg_gap': 'mean'
-                    }).reset_index()
-                    summary.columns = ['Skill Type', 'Avg Demand', 'Avg Supply', 'Avg Gap']
-                    st.dataframe(summary, use_container_width=True, hide_index=True)
+        render_skill_trends(db_version, countries, skills, selected_country_codes, country_key, year_range)
     
     elif view == "Rising vs Lagging":
         st.header("📈 Rising vs Lagging Analysis")
@@ -857,7 +904,11 @@ def main():
         to identify countries where digital/AI job demand and supply are rising or lagging.
         """)
         
-        rising_lagging_df = get_rising_lagging_analysis(selected_country_codes)
+        try:
+            rising_lagging_df = get_rising_lagging_analysis(db_version, country_key)
+        except duckdb.ConnectionException:
+            # Cut off by another session reopening the rebuilt database
+            st.rerun()
         
         if not rising_lagging_df.empty:
             # Show selected countries list
@@ -865,8 +916,7 @@ def main():
                 st.info(f"**Selected Countries:** {', '.join([next((c[1] for c in countries if c[0] == code), code) for code in selected_country_codes])}")
             # Scatter plot
             st.subheader("Growth Comparison")
-            chart = create_rising_lagging_map(rising_lagging_df)
-            st.altair_chart(chart, use_container_width=True)
+            st.vega_lite_chart(rising_lagging_df, RISING_LAGGING_SPEC, use_container_width=True)
             
             # Map visualization
             st.subheader("🗺️ Geographic Distribution of Rising vs Lagging Countries")
@@ -23,6 +23,7 @@ import json
 from datetime import datetime
 import time
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
 
 # Configuration
 DATA_DIR = Path(__file__).parent / "data"
@@ -31,6 +32,8 @@ DB_PATH = DATA_DIR / "digital_jobs.duckdb"
 
 # World Bank API endpoints
 WB_API_BASE = "https://api.worldbank.org/v2"
+WB_PAGE_SIZE = 20000  # Records per API page; large enough that page 1 usually holds everything
+WB_MAX_WORKERS = 8  # Only used for the rare indicator that spills onto further pages
 WB_INDICATORS = {
     "ICT_SERVICES": "SL.EMP.ICTI.ZS",  # Employment in ICT services (% of total employment)
     "ICT_MANUFACTURING": "SL.EMP.ICTM.ZS",  # Employment in ICT manufacturing (% of total employment)
@@ -48,38 +51,48 @@ SAMPLE_COUNTRIES = [
 ]
 
 
-def download_wb_indicator(indicator_code, indicator_name):
-    """Download indicator data from World Bank API."""
-    print(f"Downloading {indicator_name} ({indicator_code})...")
-    
+def fetch_wb_page(indicator_code, page):
+    """Fetch a single page of indicator data from World Bank API."""
     url = f"{WB_API_BASE}/country/all/indicator/{indicator_code}"
     params = {
         "format": "json",
-        "per_page": 20000,
+        "per_page": WB_PAGE_SIZE,
+        "page": page,
         "date": "2000:2024"
     }
     
+    response = requests.get(url, params=params, timeout=30)
+    response.raise_for_status()
+    return response.json()
+
+
+def download_wb_indicator(indicator_code, indicator_name):
+    """Download indicator data from World Bank API."""
+    print(f"Downloading {indicator_name} ({indicator_code})...")
+    
     try:
-        response = requests.get(url, params=params, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        # The first page tells us how many pages there are; fetch the rest concurrently
+        data = fetch_wb_page(indicator_code, 1)
         
         if len(data) < 2 or not data[1]:
             print(f"  No data available for {indicator_name}")
             return None
         
-        records = []
-        for entry in data[1]:
-            records.append({
-                "country_code": entry.get("country", {}).get("id", ""),
-                "country_name": entry.get("country", {}).get("value", ""),
-                "year": entry.get("date", ""),
-                "value": entry.get("value"),
-                "indicator_code": indicator_code,
-                "indicator_name": indicator_name
-            })
+        entries = list(data[1])
+        pages = int(data[0].get("pages", 1))
+        if pages > 1:
+            with ThreadPoolExecutor(max_workers=min(WB_MAX_WORKERS, pages - 1)) as executor:
+                for page_data in executor.map(lambda page: fetch_wb_page(indicator_code, page), range(2, pages + 1)):
+                    if len(page_data) >= 2 and page_data[1]:
+                        entries.extend(page_data[1])
         
-        df = pd.DataFrame(records)
+        df = pd.json_normalize(entries)[["country.id", "country.value", "date", "value"]].rename(columns={
+            "country.id": "country_code",
+            "country.value": "country_name",
+            "date": "year"
+        })
+        df["indicator_code"] = indicator_code
+        df["indicator_name"] = indicator_name
         df = df[df["value"].notna()]
         df["year"] = pd.to_numeric(df["year"], errors="coerce")
         df = df[df["year"].notna()]
@@ -219,12 +232,12 @@ def create_database():
     """)
     print(f"✓ Created digital_jobs table with {len(digital_jobs_df)} records")
     
-    # Create aggregated views for easier querying
-    print("\nCreating aggregated views...")
+    # Pre-aggregate into summary tables so the dashboard never scans digital_jobs for them
+    print("\nCreating aggregated tables...")
     
     # Country-level trends
     conn.execute("""
-        CREATE VIEW country_trends AS
+        CREATE TABLE country_trends AS
         SELECT 
             country_code,
             country_name,
@@ -237,11 +250,11 @@ def create_database():
         GROUP BY country_code, country_name, year
         ORDER BY country_code, year
     """)
-    print("✓ Created country_trends view")
+    print("✓ Created country_trends table")
     
     # Industry-level trends
     conn.execute("""
-        CREATE VIEW industry_trends AS
+        CREATE TABLE industry_trends AS
         SELECT 
             industry,
             year,
@@ -253,11 +266,11 @@ def create_database():
         GROUP BY industry, year
         ORDER BY industry, year
     """)
-    print("✓ Created industry_trends view")
+    print("✓ Created industry_trends table")
     
     # Skill-level trends
     conn.execute("""
-        CREATE VIEW skill_trends AS
+        CREATE TABLE skill_trends AS
         SELECT 
             skill_type,
             year,
@@ -269,11 +282,53 @@ def create_database():
         GROUP BY skill_type, year
         ORDER BY skill_type, year
     """)
-    print("✓ Created skill_trends view")
+    print("✓ Created skill_trends table")
+    
+    # Country breakdowns by industry and by skill; the sums and record counts
+    # let the dashboard re-aggregate any subset of countries exactly
+    conn.execute("""
+        CREATE TABLE industry_country_trends AS
+        SELECT 
+            country_code,
+            country_name,
+            industry,
+            year,
+            AVG(demand_index) AS avg_demand,
+            AVG(supply_index) AS avg_supply,
+            AVG(gap) AS avg_gap,
+            SUM(demand_index) AS sum_demand,
+            SUM(supply_index) AS sum_supply,
+            SUM(gap) AS sum_gap,
+            COUNT(*) AS num_records
+        FROM digital_jobs
+        GROUP BY country_code, country_name, industry, year
+        ORDER BY country_code, industry, year
+    """)
+    print("✓ Created industry_country_trends table")
+    
+    conn.execute("""
+        CREATE TABLE skill_country_trends AS
+        SELECT 
+            country_code,
+            country_name,
+            skill_type,
+            year,
+            AVG(demand_index) AS avg_demand,
+            AVG(supply_index) AS avg_supply,
+            AVG(gap) AS avg_gap,
+            SUM(demand_index) AS sum_demand,
+            SUM(supply_index) AS sum_supply,
+            SUM(gap) AS sum_gap,
+            COUNT(*) AS num_records
+        FROM digital_jobs
+        GROUP BY country_code, country_name, skill_type, year
+        ORDER BY country_code, skill_type, year
+    """)
+    print("✓ Created skill_country_trends table")
     
     # Rising/lagging analysis
     conn.execute("""
-        CREATE VIEW rising_lagging_countries AS
+        CREATE TABLE rising_lagging_countries AS
         WITH recent_data AS (
             SELECT 
                 country_code,
@@ -308,7 +363,18 @@ def create_database():
         WHERE historical_demand IS NOT NULL AND historical_supply IS NOT NULL
         ORDER BY demand_growth_pct DESC
     """)
-    print("✓ Created rising_lagging_countries view")
+    print("✓ Created rising_lagging_countries table")
+    
+    # Dataset-wide stats, so the dashboard doesn't scan digital_jobs for them
+    conn.execute("""
+        CREATE TABLE meta AS
+        SELECT 
+            MIN(year) AS min_year,
+            MAX(year) AS max_year,
+            COUNT(*) AS n_rows
+        FROM digital_jobs
+    """)
+    print("✓ Created meta table")
     
     conn.close()
     
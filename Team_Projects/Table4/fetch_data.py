@@ -1,4 +1,6 @@
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pv
 import wbgapi as wb
 import os
 
@@ -10,7 +12,9 @@ def fetch_indicator(indicator, name):
     try:
         # Fetch data for all countries, most recent 5 years
         df = wb.data.DataFrame(indicator, mrv=5)
-        df.to_csv(f"{DATA_DIR}/{name}.csv")
+        # Write with PyArrow's C++ CSV writer; keep the economy index as a column like to_csv did
+        table = pa.Table.from_pandas(df.reset_index(), preserve_index=False)
+        pv.write_csv(table, f"{DATA_DIR}/{name}.csv")
         print(f"Saved {name}.csv")
     except Exception as e:
         print(f"Failed to fetch {name}: {e}")